@@ -17,11 +17,29 @@ handling data transformation, validation, and persistent storage.
 
 from flask import Flask, request, jsonify, make_response
 from flask_cors import CORS
+import atexit
 import json
+import logging
+import logging.handlers
+import queue
 import traceback
 import os
 import sys
 import concurrent.futures
+
+# Route all logging through a queue so handler I/O happens on a background
+# thread instead of the request thread; records are formatted lazily.
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(
+    logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.basicConfig(level=logging.INFO,
+                    handlers=[logging.handlers.QueueHandler(_log_queue)])
+logger = logging.getLogger(__name__)
+
 print("Starting API with the following configuration:")
 print(f"Python version: {sys.version}")
 print(f"Current directory: {os.getcwd()}")
@@ -66,7 +84,8 @@ def get_all_users():
     """Get all users from the database."""
     try:
         with db_manager:
-            users = db_manager.get_all_users()
+            # get_all_users streams rows lazily; materialize for jsonify
+            users = list(db_manager.get_all_users())
         return jsonify(users)
     except Exception as e:
         error_message = f"Error retrieving users: {str(e)}"
@@ -213,6 +232,31 @@ def get_user_connections(user_id):
         traceback.print_exc()  # Print detailed error information
         return jsonify({"error": error_message}), 500
 
+@app.route('/profile/<username>', methods=['GET'])
+def get_profile(username):
+    """
+    Get a user and their full connection list in one request.
+
+    Serves the profile screen, which always needs both, without the
+    separate /people/<id> and /people/<id>/connections round-trips.
+
+    Response:
+        - JSON object with 'user' (the profile) and 'connections' (list)
+        - 404 error if no user has the given username
+    """
+    try:
+        with db_manager:
+            bundle = db_manager.get_profile_bundle(username)
+            if bundle:
+                return jsonify(bundle)
+            else:
+                return jsonify({"error": f"User with username {username} not found"}), 404
+    except Exception as e:
+        error_message = f"Error retrieving profile: {str(e)}"
+        print(error_message)
+        traceback.print_exc()  # Print detailed error information
+        return jsonify({"error": error_message}), 500
+
 @app.route('/connections', methods=['POST'])
 def add_connection():
     """
@@ -288,9 +332,9 @@ def add_connection():
                     tag_list = []
                 
                 if tag_list:
-                    print(f"Updating recent tags for user {user_id} with: {tag_list}")
+                    logger.debug("Updating recent tags for user %s with: %s", user_id, tag_list)
                     db_manager.update_user_recent_tags(user_id, tag_list)
-        
+
         if success:
             return jsonify({"message": "Connection added successfully"}), 201
         else:
@@ -384,9 +428,9 @@ def update_connection():
                     tag_list = []
                     
                 if tag_list:
-                    print(f"Updating recent tags for user {user_id} with: {tag_list}")
+                    logger.debug("Updating recent tags for user %s with: %s", user_id, tag_list)
                     db_manager.update_user_recent_tags(user_id, tag_list)
-        
+
         if success:
             return jsonify({"message": "Connection updated successfully"})
         else:
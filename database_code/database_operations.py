@@ -6,11 +6,216 @@ including user management, relationship handling, and utility functions.
 """
 
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
+import psycopg2.pool
+from cachetools import TTLCache
 from typing import Dict, List, Any, Optional, Tuple
-from config import DATABASE_URL, MAX_RECENT_TAGS, DEFAULT_TAGS
+from werkzeug.security import check_password_hash, generate_password_hash
+from config import (DATABASE_URL, MAX_RECENT_TAGS, DEFAULT_TAGS,
+                    DB_POOL_MIN, DB_POOL_MAX,
+                    DB_STATEMENT_TIMEOUT_MS, DB_IDLE_TX_TIMEOUT_MS,
+                    REDIS_URL, REDIS_CACHE_TTL)
+import csv
+import hmac
+import io
+import json
+import logging
+import random
+import sys
+import threading
 import time
-import traceback
+import types
+import uuid
+
+# Redis is optional (mirrors the OpenAI handling in config): the L2 cache
+# only activates when the package is installed and REDIS_URL is set.
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Shared connection pool: physical connections (TCP+TLS+auth) are set up
+# once and reused across DatabaseManager connect/disconnect cycles.
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(connection_string: str) -> psycopg2.pool.ThreadedConnectionPool:
+    """Return the shared connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = psycopg2.pool.ThreadedConnectionPool(
+                    DB_POOL_MIN, DB_POOL_MAX, connection_string,
+                    options=(f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS} "
+                             f"-c idle_in_transaction_session_timeout={DB_IDLE_TX_TIMEOUT_MS}"))
+    return _pool
+
+
+def close_pool() -> None:
+    """Close every pooled connection. Call once at process shutdown."""
+    global _pool, _writeback_pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+        if _writeback_pool is not None:
+            _writeback_pool.closeall()
+            _writeback_pool = None
+
+
+# Small side pool for lossy background writes (last-login bumps). Keeping
+# these off the main pool means a slow WAL fsync can't hold a slot that a
+# latency-sensitive read is waiting for; synchronous_commit=off removes the
+# fsync from the commit entirely, which is fine for data we can afford to
+# lose on a crash.
+_writeback_pool = None
+
+
+def _get_writeback_pool(connection_string: str) -> psycopg2.pool.ThreadedConnectionPool:
+    """Return the shared writeback pool, creating it on first use."""
+    global _writeback_pool
+    if _writeback_pool is None:
+        with _pool_lock:
+            if _writeback_pool is None:
+                _writeback_pool = psycopg2.pool.ThreadedConnectionPool(
+                    1, 2, connection_string,
+                    options=(f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS} "
+                             "-c synchronous_commit=off"))
+    return _writeback_pool
+
+# Fields that update_user is allowed to touch, in a fixed order so the
+# UPDATE below is a single stable SQL text the server can plan-cache.
+_USER_UPDATE_FIELDS = (
+    'first_name', 'last_name', 'email', 'phone_number', 'location',
+    'university', 'uni_major', 'interests', 'high_school', 'gender',
+    'ethnicity', 'job_title', 'current_company', 'profile_image_url',
+    'linkedin_url', 'birthday'
+)
+
+# Per-field presence flags keep columns at their current value when the
+# caller did not supply them, so partial updates work without rebuilding
+# the SQL per call -- while an explicit null still clears the column
+# (COALESCE would silently ignore it).
+_UPDATE_USER_SQL = "UPDATE people SET " + ", ".join(
+    f"{field} = CASE WHEN %({field}_set)s THEN %({field})s ELSE {field} END"
+    for field in _USER_UPDATE_FIELDS
+) + " WHERE id = %(id)s"
+
+# Updatable relationship fields and their pre-built SET fragments, so
+# update_connection joins cached strings instead of rebuilding them per call.
+_CONNECTION_UPDATE_FIELDS = frozenset(
+    ('notes', 'tags', 'relationship_description', 'what_they_are_working_on')
+)
+_CONNECTION_SET_FRAGMENTS = {
+    field: f"{field} = %s" for field in _CONNECTION_UPDATE_FIELDS
+}
+
+# Low-cardinality string columns in batch connection fetches: the same
+# handful of values repeat across thousands of rows, so sys.intern
+# deduplicates them into shared objects.
+_INTERN_COLUMNS = (
+    'relationship_description', 'location', 'university', 'high_school',
+    'gender', 'ethnicity', 'uni_major', 'job_title', 'current_company'
+)
+
+# Column order shared by the single-row and bulk user INSERT paths.
+_ADD_USER_COLUMNS = (
+    'first_name', 'last_name', 'email', 'phone_number', 'birthday',
+    'location', 'university', 'interests', 'high_school',
+    'gender', 'ethnicity', 'uni_major', 'job_title', 'current_company',
+    'profile_image_url', 'linkedin_url', 'recent_tags'
+)
+
+_ADD_USERS_SQL = (
+    "INSERT INTO people (" + ", ".join(_ADD_USER_COLUMNS) + ") VALUES %s RETURNING id"
+)
+
+# Explicit projection for user reads: this is the API contract the Swift
+# client deserializes. Spelling it out (instead of SELECT *) keeps future
+# schema additions from silently inflating every payload, and keeps the
+# query text constant across deploys. Built once at import time.
+_USER_COLUMNS = (
+    'id', 'first_name', 'last_name', 'email', 'phone_number',
+    'gender', 'ethnicity', 'birthday', 'location',
+    'high_school', 'university', 'uni_major',
+    'job_title', 'current_company', 'interests',
+    'profile_image_url', 'linkedin_url', 'recent_tags', 'created_at'
+)
+_USER_COLS_SQL = ", ".join(_USER_COLUMNS)
+# Same list qualified with the alias used when joining people to logins
+_USER_COLS_P_SQL = ", ".join(f"p.{col}" for col in _USER_COLUMNS)
+
+# Read statements composed once at import: every call then executes the
+# same string object instead of re-interpolating the column list, which
+# also keeps the statement text byte-identical for server plan caching.
+_GET_ALL_USERS_SQL = f"SELECT {_USER_COLS_SQL} FROM people"
+
+_GET_USER_BY_ID_SQL = f"SELECT {_USER_COLS_SQL} FROM people WHERE id = %s;"
+
+_GET_USER_BY_EMAIL_SQL = f"SELECT {_USER_COLS_SQL} FROM people WHERE email = %s;"
+
+_GET_USER_BY_USERNAME_SQL = (
+    f"SELECT {_USER_COLS_P_SQL}, l.username FROM people p "
+    "JOIN logins l ON l.people_id = p.id WHERE l.username = %s;"
+)
+
+_GET_USERS_BY_IDS_SQL = f"SELECT {_USER_COLS_SQL} FROM people WHERE id = ANY(%s);"
+
+# The ILIKE arms are all served by the trigram indexes (BitmapOr);
+# similarity() ranks the closest matches first and LIMIT bounds the
+# payload as the user base grows
+_SEARCH_USERS_SQL = f"""
+SELECT {_USER_COLS_SQL} FROM people
+WHERE
+    first_name ILIKE %(pattern)s OR
+    last_name ILIKE %(pattern)s OR
+    location ILIKE %(pattern)s OR
+    interests ILIKE %(pattern)s OR
+    university ILIKE %(pattern)s OR
+    high_school ILIKE %(pattern)s
+ORDER BY GREATEST(
+    similarity(first_name, %(term)s),
+    similarity(last_name, %(term)s),
+    similarity(coalesce(location, ''), %(term)s),
+    similarity(coalesce(university, ''), %(term)s)
+) DESC, first_name, last_name
+LIMIT 50;
+"""
+
+_PROFILE_BUNDLE_SQL = f"""
+WITH u AS (
+    SELECT {_USER_COLS_P_SQL}, l.username
+    FROM people p
+    JOIN logins l ON l.people_id = p.id
+    WHERE l.username = %s
+)
+SELECT row_to_json(u) AS user,
+       COALESCE((
+           SELECT json_agg(c)
+           FROM (
+               SELECT {_USER_COLS_P_SQL}, cl.username,
+                      r.relationship_description, r.notes AS custom_note,
+                      r.tags, r.what_they_are_working_on, r.last_viewed
+               FROM relationships r
+               JOIN people p ON p.id = r.contact_id
+               LEFT JOIN logins cl ON cl.people_id = p.id
+               WHERE r.user_id = u.id
+               ORDER BY r.last_viewed DESC NULLS LAST,
+                        p.first_name, p.last_name
+           ) c
+       ), '[]'::json) AS connections
+FROM u;
+"""
+
+# Defaults merged into add_user payloads in one dict merge instead of a
+# per-field presence loop. Read-only so a buggy caller can't mutate it.
+_ADD_USER_DEFAULTS = types.MappingProxyType(
+    {field: None for field in _ADD_USER_COLUMNS})
 
 class DatabaseManager:
     """
@@ -22,18 +227,56 @@ class DatabaseManager:
         """Initialize the database manager with a connection string."""
         try:
             self.connection_string = connection_string
-            print(f"Initializing DatabaseManager with connection string (partially hidden): {connection_string[:20]}...")
+            logger.info("Initializing DatabaseManager with connection string (partially hidden): %s...",
+                        connection_string[:20])
             # Test connection to database
             self.connection = None
             self.cursor = None
+            self._statements_prepared = False
+            # Serializes reconnects so concurrent failing requests don't
+            # each open their own socket (thundering herd)
+            self._reconnect_lock = threading.Lock()
+            # Short-TTL cache for username profile lookups; user rows change
+            # rarely compared to how often profiles are rendered
+            self._user_cache = TTLCache(maxsize=10_000, ttl=60)
+            self._user_cache_lock = threading.Lock()
+            # Optional Redis L2: shares the profile cache across workers and
+            # broadcasts invalidations so every worker drops its L1 entry
+            self._redis = None
+            if redis is not None and REDIS_URL:
+                try:
+                    self._redis = redis.Redis.from_url(
+                        REDIS_URL, socket_timeout=0.1, decode_responses=True)
+                    inval_listener = threading.Thread(
+                        target=self._redis_inval_loop,
+                        name='user-inval-listener', daemon=True)
+                    inval_listener.start()
+                except Exception:
+                    logger.exception("Redis unavailable; running with in-process cache only")
+                    self._redis = None
+            # Connection lists are read on every profile view but change
+            # rarely; shorter TTL since staleness is more visible here
+            self._conn_cache = TTLCache(maxsize=10_000, ttl=30)
+            self._conn_cache_lock = threading.Lock()
+            # Coalescing queues for write-behind timestamp bumps (see
+            # update_last_login and update_last_viewed)
+            self._login_queue = set()
+            self._login_queue_lock = threading.Lock()
+            self._viewed_queue = set()
+            self._viewed_queue_lock = threading.Lock()
+            self._writeback_event = threading.Event()
+            self._writeback_flusher = threading.Thread(
+                target=self._writeback_loop,
+                name='writeback-flusher', daemon=True)
+            self._writeback_flusher.start()
             self.connect()
-            print("Database connection successful!")
-        except Exception as e:
-            print(f"ERROR initializing database connection: {str(e)}")
-            traceback.print_exc()
+            logger.info("Database connection successful")
+        except Exception:
+            logger.exception("Error initializing database connection")
             # Don't raise here to allow the API to start even with db issues
             self.connection = None
             self.cursor = None
+            self._statements_prepared = False
         
     def connect(self) -> bool:
         """
@@ -44,59 +287,244 @@ class DatabaseManager:
             bool: True if connection successful, False otherwise
         """
         max_retries = 3
-        retry_count = 0
-        
-        while retry_count <= max_retries:
+        # First retry is immediate; afterwards back off exponentially with
+        # jitter, capping total added latency well under a second so a
+        # request can still fail fast during an outage
+        delay = 0.05
+
+        for attempt in range(1, max_retries + 2):
             try:
-                print(f"Connection attempt {retry_count + 1}/{max_retries + 1}...")
-                self._connect()
-                self.cursor = self.connection.cursor(cursor_factory=psycopg2.extras.DictCursor)
+                logger.info("Connection attempt %d/%d...", attempt, max_retries + 1)
+                with self._reconnect_lock:
+                    self._connect()
+                    # RealDictCursor returns rows that already are dicts, so fetch
+                    # results can be handed to callers without a per-row copy
+                    self.cursor = self.connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+                    self._prepare_statements()
                 return True
             except psycopg2.Error as e:
-                retry_count += 1
-                print(f"Connection attempt {retry_count} failed: {e}")
-                time.sleep(1)  # Wait a second before retry
-                
-                if retry_count > max_retries:
-                    print(f"Failed to connect to database after {max_retries} attempts")
+                logger.warning("Connection attempt %d failed: %s", attempt, e)
+
+                if attempt > max_retries:
+                    logger.error("Failed to connect to database after %d attempts", max_retries)
                     return False
-        
+                if attempt > 1:
+                    # Jitter desynchronizes workers retrying after the same
+                    # failure so they don't stampede the server together
+                    time.sleep(delay + random.random() * 0.05)
+                    delay = min(delay * 2, 0.4)
+
         return False
     
     def _connect(self):
         """Establish a connection to the database."""
         try:
             if self.connection is None or self.connection.closed:
-                self.connection = psycopg2.connect(self.connection_string)
+                # Check a connection out of the shared pool rather than paying
+                # a TCP+TLS+auth handshake; session timeouts are applied in
+                # the pool's connection options
+                self.connection = _get_pool(self.connection_string).getconn()
                 self.connection.autocommit = False
-        except Exception as e:
-            print(f"Error connecting to database: {str(e)}")
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error connecting to database")
             raise
-    
+
+    def _prepare_statements(self):
+        """
+        Register server-side prepared statements for the hot user lookups.
+
+        PREPARE runs the parser/planner once per session; the lookup methods
+        then EXECUTE the cached plan by name. Re-run automatically whenever
+        connect() builds a fresh session.
+        """
+        try:
+            # Pooled sessions may already hold these from a previous checkout
+            self.cursor.execute("DEALLOCATE ALL")
+            self.cursor.execute(f"""
+                PREPARE get_user_by_id_stmt (int) AS
+                    SELECT {_USER_COLS_SQL} FROM people WHERE id = $1;
+                PREPARE get_user_by_username_stmt (text) AS
+                    SELECT {_USER_COLS_P_SQL}, l.username FROM people p
+                    JOIN logins l ON l.people_id = p.id
+                    WHERE l.username = $1;
+                PREPARE get_user_by_email_stmt (text) AS
+                    SELECT {_USER_COLS_SQL} FROM people WHERE email = $1;
+            """)
+            self.connection.commit()
+            self._statements_prepared = True
+        except Exception as e:
+            # Non-fatal: the lookup methods fall back to plain parameterized SQL
+            self.connection.rollback()
+            self._statements_prepared = False
+            logger.warning("Could not prepare statements: %s", e)
+
+    def _redis_inval_loop(self):
+        """Drop L1 entries when any worker publishes a username invalidation."""
+        try:
+            pubsub = self._redis.pubsub()
+            pubsub.subscribe('user_inval')
+            for message in pubsub.listen():
+                if message.get('type') != 'message':
+                    continue
+                with self._user_cache_lock:
+                    self._user_cache.pop(message['data'], None)
+        except Exception:
+            logger.exception("Redis invalidation listener stopped")
+
+    def _redis_get_user(self, username: str) -> Optional[Dict]:
+        """Fetch a cached user row from Redis, or None on miss/error."""
+        if self._redis is None:
+            return None
+        try:
+            payload = self._redis.get(f"user:{username}")
+            return json.loads(payload) if payload else None
+        except Exception as e:
+            logger.warning("Redis read failed for %s: %s", username, e)
+            return None
+
+    def _redis_store_user(self, username: str, user: Dict) -> None:
+        """Write-through a user row to Redis with the configured TTL."""
+        if self._redis is None:
+            return
+        try:
+            # default=str coerces the created_at timestamp to a string;
+            # cached hits therefore serialize it as ISO text
+            self._redis.setex(f"user:{username}", REDIS_CACHE_TTL,
+                              json.dumps(user, default=str))
+        except Exception as e:
+            logger.warning("Redis write failed for %s: %s", username, e)
+
+    def _invalidate_username(self, username: str) -> None:
+        """Drop a username from the local cache and, if enabled, Redis."""
+        with self._user_cache_lock:
+            self._user_cache.pop(username, None)
+        if self._redis is not None:
+            try:
+                self._redis.delete(f"user:{username}")
+                # Other workers drop their L1 copy via the pub/sub channel
+                self._redis.publish('user_inval', username)
+            except Exception as e:
+                logger.warning("Redis invalidation failed for %s: %s", username, e)
+
+    def _writeback_loop(self):
+        """Background loop draining the write-behind queues every ~50 ms."""
+        while True:
+            self._writeback_event.wait(timeout=0.05)
+            self._writeback_event.clear()
+            self._flush_pending_last_logins()
+            self._flush_pending_last_viewed()
+
+    def _flush_pending_last_logins(self):
+        """Write all queued last-login bumps as one UPDATE on a pooled connection."""
+        with self._login_queue_lock:
+            if not self._login_queue:
+                return
+            user_ids = list(self._login_queue)
+            self._login_queue.clear()
+
+        conn = None
+        try:
+            conn = _get_writeback_pool(self.connection_string).getconn()
+            with conn.cursor() as cursor:
+                # RETURNING lets us spot ids with no login row without a
+                # separate verification SELECT
+                cursor.execute(
+                    "UPDATE logins SET last_login = NOW() "
+                    "WHERE people_id = ANY(%s) RETURNING people_id",
+                    (user_ids,))
+                updated = {row[0] for row in cursor.fetchall()}
+            conn.commit()
+            missed = set(user_ids) - updated
+            if missed:
+                logger.warning("No login row for user ids %s; last_login not bumped",
+                               sorted(missed))
+        except Exception:
+            logger.exception("Error flushing last-login updates")
+            if conn:
+                conn.rollback()
+        finally:
+            if conn:
+                _get_writeback_pool(self.connection_string).putconn(conn)
+
+    def _flush_pending_last_viewed(self):
+        """Write all queued last-viewed bumps as one UPDATE on a pooled connection."""
+        with self._viewed_queue_lock:
+            if not self._viewed_queue:
+                return
+            pairs = list(self._viewed_queue)
+            self._viewed_queue.clear()
+
+        conn = None
+        try:
+            conn = _get_writeback_pool(self.connection_string).getconn()
+            with conn.cursor() as cursor:
+                # VALUES-join: K queued pairs become one UPDATE and one
+                # WAL flush instead of K round-trips
+                psycopg2.extras.execute_values(
+                    cursor,
+                    "UPDATE relationships r SET last_viewed = NOW() "
+                    "FROM (VALUES %s) AS v(user_id, contact_id) "
+                    "WHERE r.user_id = v.user_id AND r.contact_id = v.contact_id",
+                    pairs)
+            conn.commit()
+        except Exception:
+            logger.exception("Error flushing last-viewed updates")
+            if conn:
+                conn.rollback()
+        finally:
+            if conn:
+                _get_writeback_pool(self.connection_string).putconn(conn)
+
     def disconnect(self) -> None:
-        """Close the database connection and cursor."""
+        """Release the connection back to the pool and drop the cursor."""
+        # Don't let queued timestamp bumps outlive the caller's session
+        self._flush_pending_last_logins()
+        self._flush_pending_last_viewed()
+
+        # On a dead socket close()/rollback() raise; the connection must
+        # still go back to putconn (closed, so the pool discards it) or its
+        # slot stays in the pool's used-set forever and each dropped
+        # connection permanently shrinks the pool.
+        broken = False
         try:
             if self.cursor:
                 self.cursor.close()
             if self.connection:
-                self.connection.close()
+                # Roll back any open transaction so the physical connection
+                # can be reused
+                self.connection.rollback()
+        except Exception:
+            broken = True
+            logger.exception("Error disconnecting from database")
+        finally:
+            if self.connection:
+                try:
+                    _get_pool(self.connection_string).putconn(
+                        self.connection, close=broken)
+                except Exception:
+                    logger.exception("Error returning connection to pool")
             self.cursor = None
             self.connection = None
-        except Exception as e:
-            print(f"Error disconnecting from database: {e}")
     
+    def commit(self) -> None:
+        """Commit the current transaction.
+
+        Callers that batch several writes with commit=False finalize the
+        batch with one call here, paying a single WAL flush for the group.
+        """
+        if self.connection:
+            self.connection.commit()
+
     def is_connected(self) -> bool:
         """Check if the database connection is active."""
-        if not self.connection:
-            return False
-        
-        try:
-            # Simple connection check
-            self.cursor.execute("SELECT 1")
-            return True
-        except Exception:
-            return False
+        # Local status flags only - no round-trip. A stale socket that still
+        # looks open is caught by execute_query's reconnect-on-error handling.
+        return (
+            self.connection is not None
+            and not self.connection.closed
+            and self.connection.status in (psycopg2.extensions.STATUS_READY,
+                                           psycopg2.extensions.STATUS_BEGIN)
+        )
             
     def execute_query(self, query: str, params=None, fetch=False, fetch_all=False):
         """
@@ -127,39 +555,62 @@ class DatabaseManager:
                     return True
             except psycopg2.Error as e:
                 retry_count += 1
-                print(f"Query execution attempt {retry_count} failed: {e}")
-                
-                # If connection was lost, try to reconnect
-                if "connection" in str(e).lower():
+                logger.warning("Query execution attempt %s failed: %s", retry_count, e)
+
+                # Reconnect only on connection-level failures; matching the
+                # exception class beats substring-searching the message,
+                # which also tripped on errors that merely mention the word
+                if isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)):
                     self.disconnect()
                     self.connect()
                 
                 if retry_count > max_retries:
-                    print(f"Failed to execute query after {max_retries} attempts")
+                    logger.error("Failed to execute query after %s attempts", max_retries)
                     return None
         
         return None
-    
+
+    def execute_query_stream(self, query: str, params=None, itersize: int = 1000):
+        """
+        Execute a query through a named server-side cursor, yielding rows.
+
+        The server keeps the result set and sends it in batches of itersize,
+        so the first row arrives before the last is produced and peak memory
+        is O(itersize) instead of O(result size).
+
+        Args:
+            query: SQL query to execute
+            params: Parameters for the query
+            itersize: Rows fetched from the server per batch
+
+        Returns:
+            Iterator of row dictionaries
+        """
+        # Unique name per call: named cursors live server-side and a fixed
+        # name would collide if two streams overlap on one session
+        with self.connection.cursor(name=f"stream_{uuid.uuid4().hex}",
+                                    cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.itersize = itersize
+            cursor.execute(query, params)
+            yield from cursor
+
     # ========== USER MANAGEMENT ==========
     
-    def get_all_users(self) -> List[Dict]:
+    def get_all_users(self):
         """
         Get all users from the database.
-        
+
+        Streams rows through a server-side cursor so peak memory stays
+        bounded by the batch size instead of the table size.
+
         Returns:
-            List of user dictionaries
-        """
-        query = """
-        SELECT * FROM people
+            Iterator of user dictionaries; wrap with list() if a list is needed
         """
-        
         try:
-            self.cursor.execute(query)
-            users = self.cursor.fetchall()
-            return [dict(user) for user in users]
-        except Exception as e:
-            print(f"Error retrieving users: {e}")
-            return []
+            yield from self.execute_query_stream(_GET_ALL_USERS_SQL)
+        except Exception:
+            logger.exception("Error retrieving users")
+            return
     
     def get_user_by_id(self, user_id: int) -> Optional[Dict]:
         """
@@ -171,19 +622,56 @@ class DatabaseManager:
         Returns:
             User dictionary or None if not found
         """
-        query = """
-        SELECT * FROM people
-        WHERE id = %s;
-        """
-        
+        # Tuple-prefixed keys share the username cache; plain-string keys
+        # stay reserved for usernames (the Redis layer only knows those)
+        with self._user_cache_lock:
+            cached = self._user_cache.get(('id', user_id))
+        if cached is not None:
+            # Hand out a copy: callers may mutate their result, and the
+            # cached dict must stay pristine for the rest of the TTL
+            return dict(cached)
+
         try:
-            self.cursor.execute(query, (user_id,))
+            if self._statements_prepared:
+                self.cursor.execute("EXECUTE get_user_by_id_stmt(%s)", (user_id,))
+            else:
+                self.cursor.execute(_GET_USER_BY_ID_SQL, (user_id,))
+            # RealDictCursor rows are dicts already; return without copying
             user = self.cursor.fetchone()
-            return dict(user) if user else None
+            if user:
+                # Cache a private copy so caller mutations can't reach it
+                with self._user_cache_lock:
+                    self._user_cache[('id', user_id)] = dict(user)
+            return user
         except Exception as e:
-            print(f"Error retrieving user: {e}")
+            logger.exception("Error retrieving user")
             return None
     
+    def get_users_by_ids(self, user_ids: List[int]) -> List[Dict]:
+        """
+        Get several users in one round-trip.
+
+        Callers that need N profiles (e.g. hydrating a connections list)
+        should use this instead of calling get_user_by_id in a loop - one
+        ANY(...) query replaces N round-trips.
+
+        Args:
+            user_ids: IDs of the users to fetch
+
+        Returns:
+            List of user dictionaries (order not guaranteed; missing IDs
+            are simply absent)
+        """
+        if not user_ids:
+            return []
+
+        try:
+            self.cursor.execute(_GET_USERS_BY_IDS_SQL, (list(user_ids),))
+            return self.cursor.fetchall()
+        except Exception:
+            logger.exception("Error retrieving users by ids")
+            return []
+
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """
         Get a user by username.
@@ -194,19 +682,79 @@ class DatabaseManager:
         Returns:
             User dictionary or None if not found
         """
-        query = """
-        SELECT * FROM people
-        WHERE username = %s;
-        """
-        
+        with self._user_cache_lock:
+            cached = self._user_cache.get(username)
+        if cached is not None:
+            # Hand out a copy: callers may mutate their result, and the
+            # cached dict must stay pristine for the rest of the TTL
+            return dict(cached)
+
+        cached = self._redis_get_user(username)
+        if cached is not None:
+            with self._user_cache_lock:
+                self._user_cache[username] = dict(cached)
+            return cached
+
         try:
-            self.cursor.execute(query, (username,))
+            if self._statements_prepared:
+                self.cursor.execute("EXECUTE get_user_by_username_stmt(%s)", (username,))
+            else:
+                self.cursor.execute(_GET_USER_BY_USERNAME_SQL, (username,))
             user = self.cursor.fetchone()
-            return dict(user) if user else None
+            if user:
+                # Cache a private copy so caller mutations can't reach it
+                with self._user_cache_lock:
+                    self._user_cache[username] = dict(user)
+                self._redis_store_user(username, user)
+            return user
         except Exception as e:
-            print(f"Error retrieving user by username: {e}")
+            logger.exception("Error retrieving user by username")
             return None
     
+    def get_profile_bundle(self, username: str) -> Optional[Dict]:
+        """
+        Get a user and their full connection list in one round-trip.
+
+        The profile view always needs both, so fetching them separately
+        pays two round-trips and leaves the contacts' profiles cold. The
+        connection list is aggregated server-side with json_agg, and each
+        contact that has a login is written into the username cache, so a
+        follow-up get_user_by_username for a contact is served without
+        touching the database.
+
+        Args:
+            username: The username whose profile to bundle
+
+        Returns:
+            Dict with 'user' and 'connections' keys, or None if not found
+        """
+        try:
+            self.cursor.execute(_PROFILE_BUNDLE_SQL, (username,))
+            result = self.cursor.fetchone()
+            if not result:
+                return None
+
+            user = result['user']
+            connections = result['connections']
+
+            # Warm the username cache with the contacts we just paid for.
+            # Only the profile columns are cached - never the viewer's
+            # relationship notes/tags, which belong to this user alone.
+            # Like the Redis path, JSON-aggregated rows carry timestamps
+            # as ISO strings.
+            with self._user_cache_lock:
+                self._user_cache[username] = dict(user)
+                for contact in connections:
+                    if contact.get('username'):
+                        profile = {col: contact[col] for col in _USER_COLUMNS}
+                        profile['username'] = contact['username']
+                        self._user_cache.setdefault(contact['username'], profile)
+
+            return {'user': user, 'connections': connections}
+        except Exception:
+            logger.exception("Error retrieving profile bundle")
+            return None
+
     def get_user_by_email(self, email: str) -> Optional[Dict]:
         """
         Get a user by email.
@@ -217,17 +765,30 @@ class DatabaseManager:
         Returns:
             User dictionary or None if not found
         """
-        query = """
-        SELECT * FROM people
-        WHERE email = %s;
-        """
-        
+        with self._user_cache_lock:
+            cached = self._user_cache.get(('email', email))
+        if cached is not None:
+            # Hand out a copy: callers may mutate their result, and the
+            # cached dict must stay pristine for the rest of the TTL
+            return dict(cached)
+
         try:
-            self.cursor.execute(query, (email,))
+            if self._statements_prepared:
+                self.cursor.execute("EXECUTE get_user_by_email_stmt(%s)", (email,))
+            else:
+                self.cursor.execute(_GET_USER_BY_EMAIL_SQL, (email,))
+            # RealDictCursor rows are dicts already; return without copying
             user = self.cursor.fetchone()
-            return dict(user) if user else None
+            if user:
+                # Cache a private copy so caller mutations can't reach it
+                # (sharing one copy under both keys is fine: hits copy again)
+                cached_copy = dict(user)
+                with self._user_cache_lock:
+                    self._user_cache[('email', email)] = cached_copy
+                    self._user_cache[('id', user['id'])] = cached_copy
+            return user
         except Exception as e:
-            print(f"Error retrieving user by email: {e}")
+            logger.exception("Error retrieving user by email")
             return None
     
     def search_users(self, search_term: str) -> List[Dict]:
@@ -240,28 +801,14 @@ class DatabaseManager:
         Returns:
             List of matching user dictionaries
         """
-        query = """
-        SELECT * FROM people
-        WHERE 
-            first_name ILIKE %s OR
-            last_name ILIKE %s OR
-            location ILIKE %s OR
-            interests ILIKE %s OR
-            university ILIKE %s OR
-            high_school ILIKE %s
-        ORDER BY first_name, last_name;
-        """
-        
-        search_pattern = f"%{search_term}%"
-        params = (search_pattern, search_pattern, search_pattern, 
-                 search_pattern, search_pattern, search_pattern)
-        
+        params = {'pattern': f"%{search_term}%", 'term': search_term}
+
         try:
-            self.cursor.execute(query, params)
-            users = self.cursor.fetchall()
-            return [dict(user) for user in users]
+            self.cursor.execute(_SEARCH_USERS_SQL, params)
+            # RealDictCursor rows are dicts already; return without copying
+            return self.cursor.fetchall()
         except Exception as e:
-            print(f"Error searching users: {e}")
+            logger.exception("Error searching users")
             return []
     
     def add_user(self, user_data: Dict[str, Any]) -> int:
@@ -293,40 +840,130 @@ class DatabaseManager:
         ) RETURNING id;
         """
         
-        # Ensure the recent_tags field is present, set to default tags if not provided
-        if 'recent_tags' not in user_data or user_data['recent_tags'] is None:
+        # One dict merge fills every missing column with None instead of a
+        # per-field presence loop
+        user_data = {**_ADD_USER_DEFAULTS, **user_data}
+        if user_data['recent_tags'] is None:
             user_data['recent_tags'] = DEFAULT_TAGS
         
-        # Ensure all required fields exist in the data
-        for field in ['first_name', 'last_name', 'email', 'phone_number',
-                     'location', 'university', 'interests', 'high_school',
-                     'gender', 'ethnicity', 'uni_major', 'job_title', 'current_company',
-                     'profile_image_url', 'linkedin_url']:
-            if field not in user_data:
-                user_data[field] = None
-        
         try:
-            print(f"Executing SQL: {query}")
-            print(f"With values: {user_data}")
-            
+            # Lazily formatted: no string is built unless DEBUG is enabled
+            logger.debug("Executing SQL: %s with values: %s", query, user_data)
+
             self.cursor.execute(query, user_data)
             user_id = self.cursor.fetchone()['id']
-            
+
             # Fix: Use self.connection.commit() instead of self.conn.commit()
             self.connection.commit()
-            
+
             # Add login if username and password were provided
             if username and password:
                 self.add_user_login(user_id, username, password)
-                
-            print(f"User created with ID: {user_id}")
+
+            logger.info("User created with ID: %s", user_id)
             return user_id
+        except Exception:
+            self.connection.rollback()
+            logger.exception("Error adding user")
+            raise
+
+    def add_users(self, users: List[Dict[str, Any]], page_size: int = 500) -> List[int]:
+        """
+        Bulk-insert users with a single multi-row INSERT per page.
+
+        Intended for seed scripts and imports that would otherwise loop over
+        add_user, paying a parse/plan/round-trip per row. Login credentials
+        are inserted the same way in a second batched statement, and the
+        whole load commits once.
+
+        Args:
+            users: List of user dictionaries (same shape add_user accepts)
+            page_size: Rows per INSERT statement
+
+        Returns:
+            List of new user IDs, in input order
+        """
+        rows = []
+        credentials = []
+        for user_data in users:
+            data = dict(user_data)  # don't mutate the caller's dicts
+            credentials.append((data.pop('username', None), data.pop('password', None)))
+            if data.get('recent_tags') is None:
+                data['recent_tags'] = DEFAULT_TAGS
+            rows.append(tuple(data.get(column) for column in _ADD_USER_COLUMNS))
+
+        if not rows:
+            return []
+
+        try:
+            result = psycopg2.extras.execute_values(
+                self.cursor, _ADD_USERS_SQL, rows, page_size=page_size, fetch=True)
+            user_ids = [row['id'] for row in result]
+
+            login_rows = [
+                (user_id, username, generate_password_hash(password))
+                for user_id, (username, password) in zip(user_ids, credentials)
+                if username and password
+            ]
+            if login_rows:
+                psycopg2.extras.execute_values(
+                    self.cursor,
+                    "INSERT INTO logins (people_id, username, passkey, last_login) VALUES %s",
+                    login_rows, template="(%s, %s, %s, NOW())", page_size=page_size)
+
+            self.connection.commit()
+            return user_ids
         except Exception as e:
             self.connection.rollback()
-            print(f"Error adding user: {e}")
-            traceback.print_exc()  # Print the full traceback for debugging
+            logger.exception("Error bulk adding users")
             raise
-    
+
+    def bulk_add_users(self, users: List[Dict[str, Any]],
+                       copy_threshold: int = 1000) -> int:
+        """
+        Load users via the COPY protocol, for large imports.
+
+        COPY skips per-row planning and uses the wire protocol's bulk
+        framing, which beats even multi-row INSERT once loads reach the
+        thousands of rows. Small batches route through add_users (which
+        also handles login credentials and returns IDs); COPY cannot
+        return IDs, so this path is for profile-only imports.
+
+        Args:
+            users: List of user dictionaries (same shape add_user accepts)
+            copy_threshold: Batches smaller than this use add_users
+
+        Returns:
+            Number of rows loaded
+        """
+        users = list(users)
+        if len(users) < copy_threshold:
+            return len(self.add_users(users))
+
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for user_data in users:
+            data = dict(user_data)  # don't mutate the caller's dicts
+            if data.get('recent_tags') is None:
+                data['recent_tags'] = DEFAULT_TAGS
+            # Empty CSV fields load as NULL (NULL '' below); imports don't
+            # distinguish empty strings from missing values
+            writer.writerow(
+                '' if data.get(column) is None else data[column]
+                for column in _ADD_USER_COLUMNS)
+        buf.seek(0)
+
+        try:
+            self.cursor.copy_expert(
+                f"COPY people ({', '.join(_ADD_USER_COLUMNS)}) "
+                "FROM STDIN WITH (FORMAT csv, NULL '')", buf)
+            self.connection.commit()
+            return len(users)
+        except Exception:
+            self.connection.rollback()
+            logger.exception("Error bulk loading users via COPY")
+            raise
+
     def update_user(self, user_id: int, user_data: dict) -> bool:
         """
         Update a user with new data.
@@ -339,41 +976,47 @@ class DatabaseManager:
             True if the update was successful, False otherwise
         """
         try:
-            # Check if user exists
-            if not self.get_user_by_id(user_id):
-                return False
-            
-            valid_fields = [
-                'first_name', 'last_name', 'email', 'phone_number', 'location',
-                'university', 'uni_major', 'interests', 'high_school', 'gender',
-                'ethnicity', 'job_title', 'current_company', 'profile_image_url',
-                'linkedin_url', 'birthday'
-            ]
-            
             # Filter to only valid fields
-            update_data = {k: v for k, v in user_data.items() if k in valid_fields}
-            
+            update_data = {k: v for k, v in user_data.items() if k in _USER_UPDATE_FIELDS}
+
             if not update_data:
-                return True  # Nothing to update, but not an error
-            
-            # Build SET clause
-            set_clause = ', '.join([f"{field} = %s" for field in update_data.keys()])
-            values = list(update_data.values())
-            values.append(user_id)  # Add user_id for WHERE clause
-            
-            query = f"""
-            UPDATE people
-            SET {set_clause}
-            WHERE id = %s
-            """
-            
+                # Nothing to update; just report whether the user exists,
+                # without rewriting the row
+                self.cursor.execute(
+                    "SELECT EXISTS (SELECT 1 FROM people WHERE id = %s) AS found;",
+                    (user_id,))
+                return self.cursor.fetchone()['found']
+
+            # One stable statement for every field subset: each field comes
+            # with a presence flag, so omitted fields keep their value while
+            # an explicit null clears the column, as before the static SQL.
+            params = {field: update_data.get(field) for field in _USER_UPDATE_FIELDS}
+            params.update({f"{field}_set": field in update_data
+                           for field in _USER_UPDATE_FIELDS})
+            params['id'] = user_id
+
             with self.connection.cursor() as cursor:
-                cursor.execute(query, values)
+                cursor.execute(_UPDATE_USER_SQL, params)
                 self.connection.commit()
-                
-                return cursor.rowcount > 0
-        except Exception as e:
-            print(f"Error updating user: {e}")
+
+                updated = cursor.rowcount > 0
+
+                # The caches are keyed by username, which this method doesn't
+                # know; clear the local cache and look the username up so the
+                # Redis copy and other workers' entries drop too
+                with self._user_cache_lock:
+                    self._user_cache.clear()
+                if updated:
+                    cursor.execute(
+                        "SELECT username FROM logins WHERE people_id = %s",
+                        (user_id,))
+                    row = cursor.fetchone()
+                    if row:
+                        self._invalidate_username(row[0])
+
+                return updated
+        except Exception:
+            logger.exception("Error updating user")
             self.connection.rollback()
             raise
     
@@ -389,9 +1032,74 @@ class DatabaseManager:
         Returns:
             List of connection dictionaries with user information
         """
+        with self._conn_cache_lock:
+            cached = self._conn_cache.get(user_id)
+        if cached is not None:
+            # Copy the rows too - a shallow list copy would still share
+            # the inner dicts with whoever mutates the result
+            return [dict(row) for row in cached]
+
+        connections = self.get_users_connections([user_id]).get(user_id, [])
+        # Store row copies in a tuple so cached entries can't be reached
+        # through the returned list
+        with self._conn_cache_lock:
+            self._conn_cache[user_id] = tuple(dict(row) for row in connections)
+        return connections
+
+    def get_user_connections_brief(self, user_id: int) -> List[Dict]:
+        """
+        Get a slim connection list for list-style renders.
+
+        Returns only the columns a list row displays; the full method pulls
+        24 columns including several long text fields, which multiplies
+        bytes over the wire for views that show a name and a title. Use
+        get_user_connections (or get_profile_bundle) for detail panes.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            List of slim connection dictionaries
+        """
         query = """
-        SELECT 
-            u.id, l.username, u.first_name, u.last_name,
+        SELECT
+            u.id, u.first_name, u.last_name, u.job_title, u.current_company,
+            u.profile_image_url, r.relationship_description, r.tags, r.last_viewed
+        FROM people u
+        JOIN relationships r ON u.id = r.contact_id
+        WHERE r.user_id = %s
+        ORDER BY r.last_viewed DESC NULLS LAST, u.first_name, u.last_name;
+        """
+
+        try:
+            self.cursor.execute(query, (user_id,))
+            return self.cursor.fetchall()
+        except Exception:
+            logger.exception("Error retrieving brief user connections")
+            return []
+
+    def get_users_connections(self, user_ids: List[int]) -> Dict[int, List[Dict]]:
+        """
+        Get connections for several users in one round-trip.
+
+        Dashboards and batch jobs that would otherwise call
+        get_user_connections in a loop (the N+1 pattern) get one ANY(...)
+        query instead; the relationships index is read once.
+
+        Args:
+            user_ids: IDs of the users
+
+        Returns:
+            Dict mapping each requested user ID to its (possibly empty)
+            list of connection dictionaries
+        """
+        grouped = {user_id: [] for user_id in user_ids}
+        if not grouped:
+            return grouped
+
+        query = """
+        SELECT
+            r.user_id, u.id, l.username, u.first_name, u.last_name,
             u.email, u.phone_number, u.location, u.university,
             u.interests, u.high_school, u.gender, u.ethnicity,
             u.uni_major, u.job_title, u.current_company, u.profile_image_url,
@@ -400,24 +1108,47 @@ class DatabaseManager:
         FROM people u
         JOIN relationships r ON u.id = r.contact_id
         LEFT JOIN logins l ON u.id = l.people_id
-        WHERE r.user_id = %s
-        ORDER BY r.last_viewed DESC NULLS LAST, u.first_name, u.last_name;
+        WHERE r.user_id = ANY(%s)
+        ORDER BY r.user_id, r.last_viewed DESC NULLS LAST, u.first_name, u.last_name;
         """
-        
+
         try:
-            self.cursor.execute(query, (user_id,))
-            connections = self.cursor.fetchall()
-            return [dict(conn) for conn in connections]
-        except Exception as e:
-            print(f"Error retrieving user connections: {e}")
-            return []
+            self.cursor.execute(query, (list(grouped),))
+            # RealDictCursor rows are plain dicts already; no per-row copy
+            # needed. Intern the low-cardinality string columns so repeated
+            # values ("Friend", "NYU", ...) share one object across the
+            # batch instead of one allocation per row.
+            for row in self.cursor.fetchall():
+                for col in _INTERN_COLUMNS:
+                    value = row[col]
+                    if value is not None:
+                        row[col] = sys.intern(value)
+                grouped[row['user_id']].append(row)
+            return grouped
+        except Exception:
+            logger.exception("Error retrieving user connections")
+            return grouped
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Drop any cached connection list for a user.
+
+        Write paths in this class call this automatically; it is exposed for
+        external code that modifies relationships outside DatabaseManager.
+
+        Args:
+            user_id: The ID of the user whose cached connections to drop
+        """
+        with self._conn_cache_lock:
+            self._conn_cache.pop(user_id, None)
     
-    def add_connection(self, user_id: int, contact_id: int, relationship_description: str, 
-                       notes: str = None, tags: str = None, what_they_are_working_on: str = None) -> bool:
+    def add_connection(self, user_id: int, contact_id: int, relationship_description: str,
+                       notes: str = None, tags: str = None, what_they_are_working_on: str = None,
+                       commit: bool = True) -> bool:
         """
         Add a new connection between two users.
         One-directional: only from user_id to contact_id
-        
+
         Args:
             user_id: ID of the first user
             contact_id: ID of the second user
@@ -425,26 +1156,75 @@ class DatabaseManager:
             notes: Optional detailed note about the connection
             tags: Optional comma-separated tags for the connection
             what_they_are_working_on: Optional description of what the contact is currently working on
-            
+            commit: Pass False when batching several writes into one commit
+
         Returns:
             True if successful, False otherwise
         """
+        # ON CONFLICT makes the insert idempotent: a concurrent duplicate
+        # (double-tap, retried request) no longer aborts the transaction --
+        # which, with commit=False, used to roll back the caller's whole
+        # batch -- it just leaves the existing edge in place.
         query = """
         INSERT INTO relationships (user_id, contact_id, relationship_description, notes, tags, what_they_are_working_on, last_viewed)
-        VALUES (%s, %s, %s, %s, %s, %s, NOW());
+        VALUES (%s, %s, %s, %s, %s, %s, NOW())
+        ON CONFLICT (user_id, contact_id) DO NOTHING;
         """
-        
+
         try:
             # Create the one-way relationship: user_id -> contact_id
             self.cursor.execute(query, (user_id, contact_id, relationship_description, notes, tags, what_they_are_working_on))
-            
-            self.connection.commit()
+
+            if commit:
+                self.connection.commit()
+            # Relationships are one-way, so only the owner's list changed
+            self.invalidate_user(user_id)
             return True
-        except Exception as e:
+        except Exception:
             self.connection.rollback()
-            print(f"Error adding connection: {e}")
+            logger.exception("Error adding connection")
             return False
     
+    def bulk_add_connections(self, user_id: int, connections: List[Dict[str, Any]],
+                             page_size: int = 1000) -> bool:
+        """
+        Add many connections for one user in a single batched INSERT.
+
+        Import flows that loop over add_connection pay a round-trip and a
+        commit per contact; execute_values sends up to page_size rows per
+        statement and the whole batch commits once.
+
+        Args:
+            user_id: ID of the user the connections belong to
+            connections: List of dicts with contact_id and optionally
+                relationship_description, notes, tags, what_they_are_working_on
+            page_size: Rows per INSERT statement
+
+        Returns:
+            True if successful, False otherwise
+        """
+        rows = [
+            (user_id, conn['contact_id'], conn.get('relationship_description'),
+             conn.get('notes'), conn.get('tags'), conn.get('what_they_are_working_on'))
+            for conn in connections
+        ]
+        if not rows:
+            return True
+
+        try:
+            psycopg2.extras.execute_values(
+                self.cursor,
+                "INSERT INTO relationships (user_id, contact_id, relationship_description, "
+                "notes, tags, what_they_are_working_on, last_viewed) VALUES %s",
+                rows, template="(%s, %s, %s, %s, %s, %s, NOW())", page_size=page_size)
+            self.connection.commit()
+            self.invalidate_user(user_id)
+            return True
+        except Exception:
+            self.connection.rollback()
+            logger.exception("Error bulk adding connections")
+            return False
+
     def remove_connection(self, user_id: int, contact_id: int) -> bool:
         """
         Remove a connection between two users (one-way only).
@@ -458,110 +1238,134 @@ class DatabaseManager:
         Returns:
             True if successful, False otherwise
         """
+        # One statement for the whole operation: delete the relationship,
+        # decide whether the contact is now a hanging node (no login and no
+        # remaining references from other users), and delete it if so. The
+        # CTE branches see the statement's starting snapshot, so the
+        # remaining-references check excludes the row being deleted rather
+        # than relying on seeing its absence.
         query = """
-        DELETE FROM relationships
-        WHERE user_id = %s AND contact_id = %s;
+        WITH del AS (
+            DELETE FROM relationships
+            WHERE user_id = %(user_id)s AND contact_id = %(contact_id)s
+            RETURNING contact_id
+        ),
+        orphan AS (
+            SELECT d.contact_id
+            FROM del d
+            WHERE NOT EXISTS (
+                SELECT 1 FROM logins l WHERE l.people_id = d.contact_id
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM relationships r
+                WHERE r.contact_id = d.contact_id
+                  AND r.user_id <> %(user_id)s
+            )
+        ),
+        deleted_person AS (
+            DELETE FROM people
+            WHERE id IN (SELECT contact_id FROM orphan)
+            RETURNING id
+        )
+        SELECT (SELECT COUNT(*) FROM del) AS removed,
+               (SELECT COUNT(*) FROM deleted_person) AS orphans_deleted;
         """
-        
+
         try:
-            # Remove the one-way connection
-            self.cursor.execute(query, (user_id, contact_id))
+            logger.debug("Removing connection %s -> %s", user_id, contact_id)
+            self.cursor.execute(query, {'user_id': user_id, 'contact_id': contact_id})
+            result = self.cursor.fetchone()
             self.connection.commit()
 
-            print("WE ARE REMOVING A CONNECTION")
-            
-            # Check if this contact should be deleted completely
-            # 1. Check if contact has login credentials (is a real user)
-            has_login = self.user_has_login(contact_id)
-            
-            if not has_login:
-                # 2. Check if contact is referenced by any other user
-                check_query = """
-                SELECT COUNT(*) AS connection_count
-                FROM relationships
-                WHERE contact_id = %s;
-                """
-                self.cursor.execute(check_query, (contact_id,))
-                result = self.cursor.fetchone()
-                
-                # If connection count is 0, no one references this contact anymore
-                if result and result['connection_count'] == 0:
-                    # Delete the contact from the people table
-                    delete_query = """
-                    DELETE FROM people
-                    WHERE id = %s;
-                    """
-                    self.cursor.execute(delete_query, (contact_id,))
-                    self.connection.commit()
-                    print(f"Deleted contact {contact_id} from people table as it was a hanging node.")
-            
+            if result and result['orphans_deleted']:
+                logger.info("Deleted contact %s from people table as it was a hanging node", contact_id)
+
+            self.invalidate_user(user_id)
             return True
-        except Exception as e:
+        except Exception:
             self.connection.rollback()
-            print(f"Error removing connection: {e}")
+            logger.exception("Error removing connection")
             return False
     
-    def update_connection(self, user_id: int, contact_id: int, data: Dict[str, Any]) -> bool:
+    def update_connection(self, user_id: int, contact_id: int, data: Dict[str, Any],
+                          commit: bool = True) -> bool:
         """
         Update a connection with notes, tags, or other metadata.
         Only updates the one-way relationship (from user_id to contact_id).
-        
+
         Args:
             user_id: ID of the user
             contact_id: ID of the contact
             data: Dictionary of fields to update (relationship_description, notes, tags)
-            
+            commit: Pass False when batching several writes into one commit
+
         Returns:
             True if successful, False otherwise
         """
-        # Build the SET clause dynamically based on provided fields
-        set_fields = []
-        params = []
-        
-        # Handle all updateable fields
-        for key, value in data.items():
-            if key in ['notes', 'tags', 'relationship_description', 'what_they_are_working_on']:
-                set_fields.append(f"{key} = %s")
-                params.append(value)
-        
+        # Pick the updatable fields in a fixed order so the same field subset
+        # always produces the same SQL text, using the pre-built fragments
+        fields = sorted(data.keys() & _CONNECTION_UPDATE_FIELDS)
+        set_fields = [_CONNECTION_SET_FRAGMENTS[field] for field in fields]
+        params = [data[field] for field in fields]
+
         # Always update the last_viewed timestamp
         set_fields.append("last_viewed = NOW()")
-        
-        # Create the update query
-        if not set_fields:
-            # If only updating timestamp
-            query = """
-            UPDATE relationships
-            SET last_viewed = NOW()
-            WHERE user_id = %s AND contact_id = %s;
-            """
-            params = [user_id, contact_id]
-        else:
-            params.extend([user_id, contact_id])
-            query = f"""
-            UPDATE relationships
-            SET {', '.join(set_fields)}
-            WHERE user_id = %s AND contact_id = %s;
-            """
+
+        params.extend([user_id, contact_id])
+        query = f"""
+        UPDATE relationships
+        SET {', '.join(set_fields)}
+        WHERE user_id = %s AND contact_id = %s;
+        """
         
         try:
             self.cursor.execute(query, params)
-            self.connection.commit()
+            if commit:
+                self.connection.commit()
+            self.invalidate_user(user_id)
             return True
-        except Exception as e:
+        except Exception:
             self.connection.rollback()
-            print(f"Error updating connection: {e}")
+            logger.exception("Error updating connection")
             return False
     
     def update_last_viewed(self, user_id: int, contact_id: int) -> bool:
         """
-        Update the last_viewed timestamp for a connection.
+        Record that a connection was viewed.
+
+        Every contact-card open used to cost its own UPDATE round-trip and
+        WAL flush. The pair is queued like last-login bumps and the
+        write-behind flusher coalesces everything pending into a single
+        VALUES-join UPDATE. Use update_last_viewed_sync when the new
+        timestamp must be visible to the very next read.
+
+        Args:
+            user_id: ID of the user viewing the connection
+            contact_id: ID of the contact being viewed
+
+        Returns:
+            True if the update was queued
+        """
+        try:
+            with self._viewed_queue_lock:
+                self._viewed_queue.add((user_id, contact_id))
+            self._writeback_event.set()
+            self.invalidate_user(user_id)
+            return True
+        except Exception:
+            logger.exception("Error queueing last viewed update")
+            return False
+
+    def update_last_viewed_sync(self, user_id: int, contact_id: int, commit: bool = True) -> bool:
+        """
+        Update the last_viewed timestamp for a connection immediately.
         This is a one-way update (only from user_id to contact_id).
-        
+
         Args:
             user_id: ID of the user viewing the connection
             contact_id: ID of the contact being viewed
-            
+            commit: Pass False when batching several writes into one commit
+
         Returns:
             True if successful, False otherwise
         """
@@ -570,14 +1374,16 @@ class DatabaseManager:
         SET last_viewed = NOW()
         WHERE user_id = %s AND contact_id = %s;
         """
-        
+
         try:
             self.cursor.execute(query, (user_id, contact_id))
-            self.connection.commit()
+            if commit:
+                self.connection.commit()
+            self.invalidate_user(user_id)
             return True
-        except Exception as e:
+        except Exception:
             self.connection.rollback()
-            print(f"Error updating last viewed timestamp: {e}")
+            logger.exception("Error updating last viewed timestamp")
             return False
 
     # ========== USER TAGS ==========
@@ -592,90 +1398,90 @@ class DatabaseManager:
         Returns:
             List of recent tags or empty list if none found
         """
+        # Split the CSV server-side: string_to_array runs once in C and
+        # psycopg2 adapts the text[] straight to a Python list, so no
+        # Python-side parsing remains
         query = """
-        SELECT recent_tags FROM people
+        SELECT array_remove(string_to_array(COALESCE(recent_tags, ''), ','), '') AS recent_tags
+        FROM people
         WHERE id = %s;
         """
-        
+
         try:
             self.cursor.execute(query, (user_id,))
             result = self.cursor.fetchone()
-            
+
             if result and result['recent_tags']:
-                # Convert the comma-separated string to a list
-                return result['recent_tags'].split(',')
+                return result['recent_tags']
             return []
         except Exception as e:
-            print(f"Error retrieving recent tags: {e}")
+            logger.exception("Error retrieving recent tags")
             return []
     
-    def update_user_recent_tags(self, user_id: int, new_tags: List[str], max_tags: int = MAX_RECENT_TAGS) -> bool:
+    def update_user_recent_tags(self, user_id: int, new_tags: List[str],
+                                max_tags: int = MAX_RECENT_TAGS, commit: bool = True) -> bool:
         """
         Update a user's recently used tags.
-        
+
         Args:
             user_id: The ID of the user
             new_tags: List of new tags to add to the recent tags
             max_tags: Maximum number of tags to keep in the recent tags list
-            
+            commit: Pass False when batching several writes into one commit
+
         Returns:
             True if update was successful, False otherwise
         """
-        # First, get the current recent tags
-        current_tags = self.get_user_recent_tags(user_id)
-        
-        # Create a unique list of tags with new tags at the front
-        updated_tags = []
-        
-        # Add new tags first (regardless of whether they're already in current_tags)
-        for tag in new_tags:
-            if tag and tag not in updated_tags:  # Only check for duplicates within new_tags
-                updated_tags.append(tag)
-        
-        # Then add existing tags (avoiding duplicates)
-        for tag in current_tags:
-            if tag and tag not in updated_tags:
-                updated_tags.append(tag)
-        
-        # Limit to max_tags
-        updated_tags = updated_tags[:max_tags]
-        
-        # Convert list to comma-separated string
-        tags_string = ','.join(updated_tags) if updated_tags else None
-        
-        # Update the user record
+        # Merge in one atomic statement: prepend the new tags to the stored
+        # CSV, dedup keeping first occurrence, and cap at max_tags. Doing
+        # this under the row lock also stops concurrent calls clobbering
+        # each other, which the old read-merge-write sequence allowed.
         query = """
         UPDATE people
-        SET recent_tags = %s
+        SET recent_tags = (
+            SELECT string_agg(tag, ',' ORDER BY first_seen)
+            FROM (
+                SELECT tag, MIN(ord) AS first_seen
+                FROM unnest(%s::text[] || string_to_array(COALESCE(recent_tags, ''), ','))
+                     WITH ORDINALITY AS t(tag, ord)
+                WHERE tag <> ''
+                GROUP BY tag
+                ORDER BY MIN(ord)
+                LIMIT %s
+            ) merged
+        )
         WHERE id = %s
         """
-        
+
         try:
-            self.cursor.execute(query, (tags_string, user_id))
-            self.connection.commit()
-            
+            self.cursor.execute(query, ([tag for tag in new_tags if tag], max_tags, user_id))
+            if commit:
+                self.connection.commit()
+
             if self.cursor.rowcount > 0:
-                print(f"Recent tags updated for user {user_id}")
+                logger.debug("Recent tags updated for user %s", user_id)
                 return True
             else:
-                print(f"No user found with ID {user_id}")
+                logger.warning("No user found with ID %s; recent tags not updated", user_id)
                 return False
-        except Exception as e:
+        except Exception:
             self.connection.rollback()
-            print(f"Error updating user recent tags: {e}")
+            logger.exception("Error updating user recent tags")
             return False
 
     # ========== LOGIN & AUTHENTICATION ==========
     
-    def add_user_login(self, user_id: int, username: str, passkey: str) -> bool:
+    def add_user_login(self, user_id: int, username: str, passkey: str,
+                       commit: bool = True) -> bool:
         """
         Add login credentials for a user.
-        
+
         Args:
             user_id: ID of the user
             username: Login username
             passkey: Password/key for authentication
-            
+            commit: Pass False when batching several writes into one commit
+
         Returns:
             True if successful, False otherwise
         """
@@ -683,14 +1489,18 @@ class DatabaseManager:
         INSERT INTO logins (people_id, username, passkey, last_login)
         VALUES (%s, %s, %s, NOW())
         """
-        
+
         try:
-            self.cursor.execute(query, (user_id, username, passkey))
-            self.connection.commit()
+            # Only the hash is stored; the plaintext never reaches the database
+            self.cursor.execute(
+                query, (user_id, username, generate_password_hash(passkey)))
+            if commit:
+                self.connection.commit()
+            self._invalidate_username(username)
             return True
-        except Exception as e:
+        except Exception:
             self.connection.rollback()
-            print(f"Error adding user login: {e}")
+            logger.exception("Error adding user login")
             return False
     
     def validate_login(self, username: str, passkey: str) -> Optional[int]:
@@ -704,30 +1514,40 @@ class DatabaseManager:
         Returns:
             User ID if login successful, None otherwise
         """
+        # Fetch by username only and verify the hash in Python; comparing
+        # plaintext in SQL would both store secrets in the clear and leak
+        # them into query logs. The last_login bump rides the coalesced
+        # write-behind queue rather than its own round-trip.
         query = """
-        SELECT people_id
+        SELECT people_id, passkey
         FROM logins
-        WHERE username = %s AND passkey = %s
-        """
-        
-        update_last_login_query = """
-        UPDATE logins
-        SET last_login = NOW()
-        WHERE username = %s AND passkey = %s
+        WHERE username = %s
         """
-        
+
         try:
-            self.cursor.execute(query, (username, passkey))
+            self.cursor.execute(query, (username,))
             result = self.cursor.fetchone()
-            
-            if result:
-                # Update last login timestamp
-                self.cursor.execute(update_last_login_query, (username, passkey))
+            if result is None:
+                return None
+
+            stored = result['passkey']
+            if stored.startswith(('pbkdf2:', 'scrypt:')):
+                if not check_password_hash(stored, passkey):
+                    return None
+            else:
+                # Legacy plaintext row: constant-time compare, then rewrite
+                # it hashed so the next login takes the branch above.
+                if not hmac.compare_digest(stored, passkey):
+                    return None
+                self.cursor.execute(
+                    "UPDATE logins SET passkey = %s WHERE username = %s;",
+                    (generate_password_hash(passkey), username))
                 self.connection.commit()
-                
-            return result['people_id'] if result else None
-        except Exception as e:
-            print(f"Error validating login: {e}")
+
+            self.update_last_login(result['people_id'])
+            return result['people_id']
+        except Exception:
+            logger.exception("Error validating login")
             return None
 
     def update_passwords(self, new_password: str = "password") -> bool:
@@ -741,43 +1561,19 @@ class DatabaseManager:
             True if successful, False otherwise
         """
         try:
-            # Get all users with usernames
-            self.cursor.execute("SELECT id, username, first_name, last_name FROM people WHERE username IS NOT NULL;")
-            users = self.cursor.fetchall()
-            print(f"Found {len(users)} users with usernames")
-            
-            # Update passwords for users
-            password_updates = 0
-            for user in users:
-                user_id = user['id']
-                username = user['username']
-                first_name = user['first_name']
-                last_name = user['last_name']
-                
-                # Check if login exists
-                self.cursor.execute("SELECT id FROM logins WHERE user_id = %s;", (user_id,))
-                login = self.cursor.fetchone()
-                
-                if login:
-                    # Update existing login
-                    self.cursor.execute(
-                        "UPDATE logins SET passkey = %s WHERE user_id = %s;", 
-                        (new_password, user_id)
-                    )
-                    print(f"Updated password for {first_name} {last_name} (ID: {user_id})")
-                else:
-                    # Create new login
-                    self.cursor.execute(
-                        "INSERT INTO logins (people_id, username, passkey) VALUES (%s, %s, %s);",
-                        (user_id, username, new_password)
-                    )
-                    print(f"Created login for {first_name} {last_name} (ID: {user_id})")
-                
-                password_updates += 1
-             
+            # One set-based statement instead of a SELECT plus an UPDATE or
+            # INSERT per user. Usernames live in logins (not people), so
+            # every account that can log in has a row here already; there is
+            # nothing to backfill.
+            # A single hash is fine here: every row gets the same uniform
+            # dev-reset password anyway.
+            self.cursor.execute(
+                "UPDATE logins SET passkey = %s RETURNING people_id;",
+                (generate_password_hash(new_password),))
+            updated = self.cursor.rowcount
             self.connection.commit()
-            print(f"Updated {password_updates} user passwords to '{new_password}'")
-            
+            print(f"Updated {updated} user passwords to '{new_password}'")
+
             return True
         except Exception as e:
             self.connection.rollback()
@@ -794,32 +1590,31 @@ class DatabaseManager:
             True if check completed successfully
         """
         try:
-            # Get users
-            self.cursor.execute("SELECT id, username, first_name, last_name FROM people ORDER BY id;")
-            users = self.cursor.fetchall()
-            print(f"=== Users ({len(users)}) ===")
-            for user in users:
+            # Stream each listing through a server-side cursor so the dump
+            # never materializes a whole table in memory
+            print("=== Users ===")
+            for user in self.execute_query_stream(
+                    "SELECT p.id, l.username, p.first_name, p.last_name FROM people p LEFT JOIN logins l ON p.id = l.people_id ORDER BY p.id;"):
                 print(f"{user['id']}: {user['first_name']} {user['last_name']} (username: {user['username']})")
-            
+
             # Get logins
-            self.cursor.execute("SELECT people_id, username, passkey FROM logins ORDER BY people_id;")
-            logins = self.cursor.fetchall()
-            print(f"\n=== Logins ({len(logins)}) ===")
-            for login in logins:
+            print("\n=== Logins ===")
+            for login in self.execute_query_stream(
+                    "SELECT people_id, username, passkey FROM logins ORDER BY people_id;"):
                 print(f"User ID: {login['people_id']}, Username: {login['username']}, Password: {login['passkey']}")
-            
+
             # Get relationships
-            self.cursor.execute("""
-                SELECT r.user_id, u1.first_name, r.contact_id, u2.first_name, r.relationship_description 
-                FROM relationships r
-                JOIN people u1 ON r.user_id = u1.id
-                JOIN people u2 ON r.contact_id = u2.id
-                ORDER BY r.user_id, r.contact_id;
-            """)
-            relationships = self.cursor.fetchall()
-            print(f"\n=== Relationships ({len(relationships)}) ===")
-            for rel in relationships:
-                print(f"{rel['user_id']} ({rel['first_name']}) -> {rel['contact_id']} ({rel['first_name_1']}): {rel['relationship_description']}")
+            print("\n=== Relationships ===")
+            for rel in self.execute_query_stream("""
+                    SELECT r.user_id, u1.first_name AS user_first_name,
+                           r.contact_id, u2.first_name AS contact_first_name,
+                           r.relationship_description
+                    FROM relationships r
+                    JOIN people u1 ON r.user_id = u1.id
+                    JOIN people u2 ON r.contact_id = u2.id
+                    ORDER BY r.user_id, r.contact_id;
+                """):
+                print(f"{rel['user_id']} ({rel['user_first_name']}) -> {rel['contact_id']} ({rel['contact_first_name']}): {rel['relationship_description']}")
             
             return True
         except Exception as e:
@@ -829,22 +1624,26 @@ class DatabaseManager:
     def update_last_login(self, user_id: int) -> bool:
         """
         Update the last_login timestamp for a user.
-        
+
+        The write is queued and coalesced: the background flusher batches all
+        user IDs queued within a ~50 ms window into a single
+        UPDATE ... WHERE people_id = ANY(...), so N app-open pings cost one
+        round-trip per window instead of N. Losing an unflushed timestamp on
+        crash is acceptable for this data.
+
         Args:
             user_id: The ID of the user to update
-            
+
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if the update was queued
         """
         try:
-            query = """
-                UPDATE logins 
-                SET last_login = NOW() 
-                WHERE people_id = %s
-            """
-            return self.execute_query(query, (user_id,))
-        except Exception as e:
-            print(f"Error updating last login: {e}")
+            with self._login_queue_lock:
+                self._login_queue.add(user_id)
+            self._writeback_event.set()
+            return True
+        except Exception:
+            logger.exception("Error updating last login for user_id=%s", user_id)
             return False
             
     def clean_test_data(self, real_user_id_threshold: int = 5) -> bool:
@@ -857,20 +1656,34 @@ class DatabaseManager:
         Returns:
             True if successful, False otherwise
         """
+        # One parameterized statement: the three deletes run as writable CTEs
+        # in a single round-trip and plan, with the counts returned for the
+        # summary below (previously three f-string statements, which also
+        # left the threshold open to SQL injection).
+        query = """
+        WITH deleted_connections AS (
+            DELETE FROM relationships
+            WHERE user_id > %(threshold)s OR contact_id > %(threshold)s
+            RETURNING 1
+        ),
+        deleted_logins AS (
+            DELETE FROM logins WHERE people_id > %(threshold)s RETURNING 1
+        ),
+        deleted_users AS (
+            DELETE FROM people WHERE id > %(threshold)s RETURNING 1
+        )
+        SELECT (SELECT COUNT(*) FROM deleted_connections) AS connections,
+               (SELECT COUNT(*) FROM deleted_logins) AS logins,
+               (SELECT COUNT(*) FROM deleted_users) AS users;
+        """
+
         try:
-            # Delete test users and their connections
-            self.cursor.execute(f"DELETE FROM relationships WHERE user_id > {real_user_id_threshold} OR contact_id > {real_user_id_threshold};")
-            deleted_connections = self.cursor.rowcount
-            print(f"Deleted {deleted_connections} test connections")
-            
-            self.cursor.execute(f"DELETE FROM logins WHERE people_id > {real_user_id_threshold};")
-            deleted_logins = self.cursor.rowcount
-            print(f"Deleted {deleted_logins} test logins")
-            
-            self.cursor.execute(f"DELETE FROM people WHERE id > {real_user_id_threshold};")
-            deleted_users = self.cursor.rowcount
-            print(f"Deleted {deleted_users} test users")
-            
+            self.cursor.execute(query, {'threshold': real_user_id_threshold})
+            deleted = self.cursor.fetchone()
+            print(f"Deleted {deleted['connections']} test connections")
+            print(f"Deleted {deleted['logins']} test logins")
+            print(f"Deleted {deleted['users']} test users")
+
             # Commit the changes
             self.connection.commit()
             return True
@@ -879,6 +1692,12 @@ class DatabaseManager:
             self.connection.rollback()
             return False
         
+    def __enter__(self):
+        """Context manager entry point: ensure a pooled connection is held."""
+        if not self.is_connected():
+            self.connect()
+        return self
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit point."""
         self.disconnect()
@@ -894,19 +1713,18 @@ class DatabaseManager:
             True if the user has login credentials, False otherwise
         """
         query = """
-        SELECT COUNT(*) AS login_count
-        FROM logins
-        WHERE people_id = %s;
+        SELECT EXISTS (
+            SELECT 1 FROM logins WHERE people_id = %s
+        ) AS has_login;
         """
-        
+
         try:
             self.cursor.execute(query, (user_id,))
             result = self.cursor.fetchone()
-            
-            # If login count is greater than 0, user has login credentials
-            return result and result['login_count'] > 0
-        except Exception as e:
-            print(f"Error checking if user has login: {e}")
+
+            return bool(result and result['has_login'])
+        except Exception:
+            logger.exception("Error checking if user has login")
             return False
 
 
@@ -918,17 +1736,21 @@ if __name__ == "__main__":
         db.connect()
         
         # Example 1: Get all users
+        # One write per listing instead of a str build + write + flush per
+        # row; the generator input keeps streaming intact
         print("\n--- All Users ---")
         users = db.get_all_users()
-        for user in users:
-            print(f"{user['first_name']} {user['last_name']} - {user['university']}")
-        
+        sys.stdout.writelines(
+            f"{user['first_name']} {user['last_name']} - {user['university']}\n"
+            for user in users)
+
         # Example 2: Search for users
         search_term = "New York"
         print(f"\n--- Users in {search_term} ---")
         ny_users = db.search_users(search_term)
-        for user in ny_users:
-            print(f"{user['first_name']} {user['last_name']} - {user['location']}")
+        sys.stdout.writelines(
+            f"{user['first_name']} {user['last_name']} - {user['location']}\n"
+            for user in ny_users)
         
         # Example 3: Get user by username
         username = "danieltantsyura"
@@ -945,8 +1767,9 @@ if __name__ == "__main__":
             # Example 4: Get user's connections
             print("\n--- Connections ---")
             connections = db.get_user_connections(user['id'])
-            for conn in connections:
-                print(f"{conn['first_name']} {conn['last_name']} - {conn['relationship_description']}")
+            sys.stdout.writelines(
+                f"{conn['first_name']} {conn['last_name']} - {conn['relationship_description']}\n"
+                for conn in connections)
         
         # Example 5: Adding a new user (commented out to prevent actual insertion)
         """
@@ -1,8 +1,13 @@
 import psycopg2
 from config import DATABASE_URL
 from typing import Dict, List, Any, Tuple, Optional
+from werkzeug.security import generate_password_hash
+import logging
 import psycopg2.extras
 
+logger = logging.getLogger(__name__)
+
+
 class DatabaseUtils:
     """
     Utility class for database management operations including:
@@ -54,8 +59,8 @@ class DatabaseUtils:
             conn.close()
             
             return result if fetch or fetch_all else rowcount
-        except Exception as e:
-            print(f"Database error: {e}")
+        except Exception:
+            logger.exception("Database error")
             if conn and commit:
                 conn.rollback()
             return None
@@ -106,8 +111,8 @@ class DatabaseUtils:
             cursor.close()
             conn.close()
             return True
-        except Exception as e:
-            print("An error occurred:", e)
+        except Exception:
+            logger.exception("Error checking database")
             return False
     
     @classmethod
@@ -155,7 +160,8 @@ class DatabaseUtils:
                 VALUES (%s, %s, %s, NOW());
                 """
                 
-                cur.execute(insert_query, (user_id, username, default_password))
+                cur.execute(insert_query,
+                            (user_id, username, generate_password_hash(default_password)))
                 count += 1
             
             conn.commit()
@@ -188,17 +194,29 @@ class DatabaseUtils:
             conn = psycopg2.connect(DATABASE_URL)
             cursor = conn.cursor()
             
-            # Delete test users and their connections
-            cursor.execute(f"DELETE FROM relationships WHERE user_id > {real_user_id_threshold} OR contact_id > {real_user_id_threshold};")
-            deleted_connections = cursor.rowcount
+            # Delete test users and their connections in one statement:
+            # the three deletes run as writable CTEs in a single round-trip,
+            # with the counts returned for the summary below. Mirrors
+            # DatabaseManager.clean_test_data.
+            cursor.execute("""
+                WITH deleted_connections AS (
+                    DELETE FROM relationships
+                    WHERE user_id > %(threshold)s OR contact_id > %(threshold)s
+                    RETURNING 1
+                ),
+                deleted_logins AS (
+                    DELETE FROM logins WHERE people_id > %(threshold)s RETURNING 1
+                ),
+                deleted_users AS (
+                    DELETE FROM people WHERE id > %(threshold)s RETURNING 1
+                )
+                SELECT (SELECT COUNT(*) FROM deleted_connections) AS connections,
+                       (SELECT COUNT(*) FROM deleted_logins) AS logins,
+                       (SELECT COUNT(*) FROM deleted_users) AS users;
+            """, {'threshold': real_user_id_threshold})
+            deleted_connections, deleted_logins, deleted_users = cursor.fetchone()
             print(f"Deleted {deleted_connections} test connections")
-            
-            cursor.execute(f"DELETE FROM logins WHERE people_id > {real_user_id_threshold};")
-            deleted_logins = cursor.rowcount
             print(f"Deleted {deleted_logins} test logins")
-            
-            cursor.execute(f"DELETE FROM people WHERE id > {real_user_id_threshold};")
-            deleted_users = cursor.rowcount
             print(f"Deleted {deleted_users} test users")
             
             # Commit the changes
@@ -207,8 +225,8 @@ class DatabaseUtils:
             cursor.close()
             conn.close()
             return True
-        except Exception as e:
-            print("An error occurred:", e)
+        except Exception:
+            logger.exception("Error cleaning test data")
             if conn:
                 conn.rollback()
             return False
@@ -244,22 +262,22 @@ class DatabaseUtils:
             if login:
                 # Update existing login
                 cursor.execute(
-                    "UPDATE logins SET passkey = %s WHERE people_id = %s;", 
-                    (password, user_id)
+                    "UPDATE logins SET passkey = %s WHERE people_id = %s;",
+                    (generate_password_hash(password), user_id)
                 )
             else:
                 # Create new login
                 cursor.execute(
                     "INSERT INTO logins (people_id, username, passkey) VALUES (%s, %s, %s);",
-                    (user_id, username, password)
+                    (user_id, username, generate_password_hash(password))
                 )
             
             conn.commit()
             cursor.close()
             conn.close()
             return True
-        except Exception as e:
-            print(f"Error ensuring login for user {user_id}: {e}")
+        except Exception:
+            logger.exception("Error ensuring login for user %s", user_id)
             if conn:
                 conn.rollback()
             return False
@@ -59,9 +59,12 @@ CREATE TABLE logins (
     -- User relationship
     people_id INT NOT NULL REFERENCES people(id) ON DELETE CASCADE,
     
-    -- Authentication information
-    username VARCHAR(50) NOT NULL UNIQUE,
-    passkey VARCHAR(100) NOT NULL,
+    -- Authentication information. passkey holds a werkzeug password hash
+    -- (method:salt:digest), never the plaintext. Username uniqueness is
+    -- enforced by logins_username_idx below; an inline UNIQUE here would
+    -- mean a second identical B-tree maintained on every insert.
+    username VARCHAR(50) NOT NULL,
+    passkey VARCHAR(255) NOT NULL,
     
     -- Metadata
     last_login TIMESTAMP,
@@ -89,6 +92,47 @@ CREATE TABLE relationships (
     -- Constraints
     UNIQUE (user_id, contact_id)
 );
+
+-- B-tree indexes for the username/email equality lookups.
+-- text_pattern_ops guarantees index usage for equality and prefix matches
+-- regardless of the database locale; note these indexes cannot serve
+-- collation-aware ordering (ORDER BY username), only = and LIKE 'abc%'.
+-- INCLUDE (people_id, passkey) lets validate_login's fetch-by-username
+-- be answered by an index-only scan; neither column is hot for updates
+-- (last_login, which is, stays out of the index so those bumps stay HOT).
+CREATE UNIQUE INDEX logins_username_idx ON logins (username text_pattern_ops)
+    INCLUDE (people_id, passkey);
+CREATE INDEX people_email_idx ON people (email text_pattern_ops);
+
+-- Trigram indexes for search_users: its OR of ILIKE '%term%' predicates
+-- would otherwise seqscan people on every search. With one GIN trgm index
+-- per searched column the planner answers the OR as a BitmapOr of index
+-- scans, so cost tracks matches instead of table size.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX people_first_name_trgm ON people USING gin (first_name gin_trgm_ops);
+CREATE INDEX people_last_name_trgm ON people USING gin (last_name gin_trgm_ops);
+CREATE INDEX people_location_trgm ON people USING gin (location gin_trgm_ops);
+CREATE INDEX people_interests_trgm ON people USING gin (interests gin_trgm_ops);
+CREATE INDEX people_university_trgm ON people USING gin (university gin_trgm_ops);
+CREATE INDEX people_high_school_trgm ON people USING gin (high_school gin_trgm_ops);
+
+-- Foreign-key side indexes. Postgres indexes the referenced column
+-- (people.id) but not the referencing ones, so without these every
+-- DELETE/cascade on people checks relationships.contact_id and
+-- logins.people_id with sequential scans, as does the orphan probe in
+-- remove_connection. relationships.user_id is already covered by the
+-- UNIQUE (user_id, contact_id) constraint.
+CREATE INDEX rel_contact_id_idx ON relationships (contact_id);
+CREATE INDEX logins_people_id_idx ON logins (people_id);
+
+-- Covering index for get_user_connections: satisfies the
+-- ORDER BY last_viewed DESC NULLS LAST without a sort step. Only the
+-- small columns are INCLUDEd -- the unbounded TEXT ones (notes, tags,
+-- what_they_are_working_on) would count toward the ~2.7 KB index-row
+-- limit and make large notes fail to insert; they come from the heap.
+CREATE INDEX rel_user_lastviewed_idx
+    ON relationships (user_id, last_viewed DESC NULLS LAST)
+    INCLUDE (contact_id, relationship_description, created_at);
 """
 
 def create_database():
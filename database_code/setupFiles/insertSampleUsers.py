@@ -1,4 +1,5 @@
 import psycopg2
+import psycopg2.extras
 import os
 import sys
 from datetime import datetime
@@ -203,30 +204,23 @@ sample_data = [
 
 def insert_sample_users():
     """Insert sample people into the database."""
-    # SQL INSERT command template - adjusted to match our table schema
-    insert_sql = """
-    INSERT INTO people (
-        first_name, last_name, email, phone_number, birthday,
-        location, university, interests, high_school,
-        gender, ethnicity, uni_major, job_title, current_company,
-        profile_image_url, linkedin_url, recent_tags
+    # Column order for the multi-row INSERT below
+    columns = (
+        'first_name', 'last_name', 'email', 'phone_number', 'birthday',
+        'location', 'university', 'interests', 'high_school',
+        'gender', 'ethnicity', 'uni_major', 'job_title', 'current_company',
+        'profile_image_url', 'linkedin_url', 'recent_tags'
     )
-    VALUES (
-        %(first_name)s, %(last_name)s, %(email)s, %(phone_number)s, %(birthday)s,
-        %(location)s, %(university)s, %(interests)s, %(high_school)s,
-        %(gender)s, %(ethnicity)s, %(uni_major)s, %(job_title)s, %(current_company)s,
-        %(profile_image_url)s, %(linkedin_url)s, %(recent_tags)s
-    );
-    """
+    insert_sql = f"INSERT INTO people ({', '.join(columns)}) VALUES %s"
 
     try:
         # Connect to the Railway Postgres instance
         conn = psycopg2.connect(DATABASE_URL)
         cursor = conn.cursor()
 
-        # Insert each sample record
-        for person in sample_data:
-            cursor.execute(insert_sql, person)
+        # Insert all sample records with one multi-row statement
+        rows = [tuple(person[column] for column in columns) for person in sample_data]
+        psycopg2.extras.execute_values(cursor, insert_sql, rows)
 
         # Commit the transaction
         conn.commit()
@@ -0,0 +1,56 @@
+import psycopg2
+import os
+import sys
+
+# Add parent directory to path to access config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import DATABASE_URL
+
+# Non-destructive schema upgrades for an existing database. Unlike
+# createDatabase.py this never drops tables: every statement here must be
+# idempotent so the script can be re-run safely. Run it against the live
+# database BEFORE deploying code that depends on the changes below.
+sql_commands = """
+-- Passkeys are stored as werkzeug password hashes (roughly 100-160
+-- characters), which no longer fit the original VARCHAR(100).
+ALTER TABLE logins ALTER COLUMN passkey TYPE VARCHAR(255);
+
+-- search_users ranks results with similarity(), so on a database created
+-- before the trigram work the function itself is missing and every search
+-- errors out (surfacing as empty results). Extension and indexes mirror
+-- createDatabase.py.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS people_first_name_trgm ON people USING gin (first_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS people_last_name_trgm ON people USING gin (last_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS people_location_trgm ON people USING gin (location gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS people_interests_trgm ON people USING gin (interests gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS people_university_trgm ON people USING gin (university gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS people_high_school_trgm ON people USING gin (high_school gin_trgm_ops);
+"""
+
+
+def upgrade_database():
+    """Applies non-destructive schema upgrades to an existing database."""
+    try:
+        conn = psycopg2.connect(DATABASE_URL)
+        cursor = conn.cursor()
+
+        # Execute SQL commands; note that execute() might not handle multiple statements in one call
+        # So we split on semicolons and run each one separately
+        for command in sql_commands.strip().split(';'):
+            if command.strip():
+                cursor.execute(command)
+
+        conn.commit()
+        print("Schema upgrades applied successfully.")
+
+        cursor.close()
+        conn.close()
+        return True
+    except Exception as e:
+        print("An error occurred:", e)
+        return False
+
+
+if __name__ == "__main__":
+    upgrade_database()
@@ -102,6 +102,55 @@ def test_get_user_by_username(username):
         increment_test(False)
         return None
 
+def test_get_profile(username):
+    """Test the GET /profile/<username> endpoint"""
+    log(f"\n--- Testing GET /profile/{username} ---")
+    response = requests.get(f"{BASE_URL}/profile/{username}")
+    if response.status_code == 200:
+        bundle = response.json()
+        user = bundle.get('user')
+        connections = bundle.get('connections')
+        if not user or not isinstance(connections, list):
+            log("❌ Profile bundle is missing 'user' or 'connections'")
+            increment_test(False)
+            return None
+        log(f"✅ Success! Found profile: {user['first_name']} {user['last_name']} with {len(connections)} connections")
+        increment_test(True)
+        # The bundle is JSON-aggregated server-side, so its timestamps are
+        # ISO 8601 strings - unlike the RFC-1123 dates Flask emits for the
+        # /people endpoints. Pin that contract here.
+        created_at = user.get('created_at')
+        if created_at:
+            from datetime import datetime
+            try:
+                datetime.fromisoformat(created_at)
+                log("✅ Profile timestamps are ISO 8601 formatted")
+                increment_test(True)
+            except ValueError:
+                log(f"❌ created_at is not ISO 8601: {created_at}")
+                increment_test(False)
+        return bundle
+    else:
+        log(f"❌ Failed with status code: {response.status_code}")
+        log(response.text)
+        increment_test(False)
+        return None
+
+def test_get_profile_not_found():
+    """Test the GET /profile/<username> endpoint with an unknown username"""
+    missing_username = f"no_such_user_{int(time.time())}"
+    log(f"\n--- Testing GET /profile/{missing_username} (expecting 404) ---")
+    response = requests.get(f"{BASE_URL}/profile/{missing_username}")
+    if response.status_code == 404:
+        log("✅ Success! Unknown username correctly returned 404")
+        increment_test(True)
+        return True
+    else:
+        log(f"❌ Expected 404 but got status code: {response.status_code}")
+        log(response.text)
+        increment_test(False)
+        return False
+
 def test_get_user_by_id(user_id, viewing_user_id=None):
     """Test the GET /people/<id> endpoint"""
     log(f"\n--- Testing GET /people/{user_id} ---")
@@ -810,7 +859,14 @@ def test_login_operations():
         
     log("✅ Last login timestamp updated successfully")
     increment_test(True)
-    
+
+    # Verify the bundled profile endpoint serves this username, and that
+    # unknown usernames 404
+    if not test_get_profile(username):
+        return False
+    if not test_get_profile_not_found():
+        return False
+
     return True
 
 def run_basic_tests():
@@ -831,7 +887,12 @@ def run_basic_tests():
         for user in users:
             if user.get('username'):
                 test_get_user_by_username(user['username'])
+                # Test 3b: Get the bundled profile for the same username
+                test_get_profile(user['username'])
                 break
+
+        # Test 3c: Profile lookup for an unknown username returns 404
+        test_get_profile_not_found()
         
         # Test 4: Get user by ID
         test_get_user_by_id(existing_user_id)